@@ -3,178 +3,172 @@
 HTTP MCP Client for testing the filesystem usage server
 
 This client uses the current MCP Python SDK to connect to the HTTP MCP server
-with proper CORS support.
+with proper CORS support. The four JSON-RPC calls are dispatched in parallel,
+overlapping their round-trip latency instead of waiting on each in turn.
 """
 
 import asyncio
-import json
+import sys
+
 import httpx
+import orjson
+
+MCP_URL = "http://localhost:8000/mcp/"
+
+# Shared headers, built once at import time
+HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream"
+}
+
+# The four JSON-RPC request bodies are static, so serialize them to bytes
+# once at module load instead of paying json.dumps + dict allocation per call
+PAYLOADS = [
+    orjson.dumps({
+        "jsonrpc": "2.0",
+        "id": i,
+        "method": method,
+        "params": params,
+    })
+    for i, (method, params) in enumerate(
+        [
+            ("tools/call", {"name": "health", "arguments": {}}),
+            ("tools/call", {"name": "get_disk_usage", "arguments": {}}),
+            ("tools/call", {"name": "get_detailed_disk_info", "arguments": {}}),
+            ("tools/list", {}),
+        ],
+        start=1,
+    )
+]
+
+def parse_mcp_response(response):
+    """Parse an MCP response body, handling both plain JSON and SSE framing"""
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        # Each SSE event carries one JSON-RPC message on its data: line
+        for line in response.content.split(b"\n"):
+            if line.startswith(b"data:"):
+                return orjson.loads(line[5:])
+        raise ValueError("No data event in SSE response")
+    return orjson.loads(response.content)
+
+def joined_text(content):
+    """Concatenate the text of all text content blocks in a tool result"""
+    return "\n".join(item["text"] for item in content if "text" in item)
 
 async def test_http_mcp_server():
     """Test the HTTP MCP server with proper HTTP client"""
-    
-    print("Testing HTTP MCP Filesystem Usage Server...")
-    print("Server URL: http://localhost:8000/mcp")
-    
+
+    # Buffer all report lines and write them in one shot at the end rather
+    # than paying a locked, possibly-flushing print() per line
+    out = []
+
+    out.append("Testing HTTP MCP Filesystem Usage Server...\n")
+    out.append("Server URL: http://localhost:8000/mcp\n")
+
     try:
-        # Create HTTP client for MCP server
+        # One client for the whole test run; note that on HTTP/1.1 each
+        # in-flight request gets its own TCP connection, so the gather below
+        # opens four parallel connections (uvicorn serves plain HTTP/1.1;
+        # there is no h2 multiplexing to negotiate without TLS ALPN)
         async with httpx.AsyncClient() as client:
-            # Test health endpoint
-            print("\n1. Testing health endpoint...")
-            health_response = await client.post(
-                "http://localhost:8000/mcp/",
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json, text/event-stream"
-                },
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "health",
-                        "arguments": {}
-                    }
-                }
+            # Dispatch all four JSON-RPC calls concurrently, posting the
+            # pre-serialized bodies as-is
+            out.append("\nDispatching 4 requests over parallel connections...\n")
+            responses = await asyncio.gather(
+                *[client.post(MCP_URL, headers=HEADERS, content=payload) for payload in PAYLOADS]
             )
-            
-            print(f"Health response status: {health_response.status_code}")
+            health_response, disk_response, detailed_response, list_response = responses
+
+            # Report results sequentially once everything has arrived
+            out.append("\n1. Testing health endpoint...\n")
+            out.append(f"Health response status: {health_response.status_code}\n")
             if health_response.status_code == 200:
-                print("✅ Health check successful!")
-                print(f"Response: {health_response.text}")
+                out.append("✅ Health check successful!\n")
+                out.append(f"Response: {health_response.text}\n")
             else:
-                print(f"❌ Health check failed: {health_response.status_code}")
-                print(f"Response: {health_response.text}")
-            
-            # Test get_disk_usage
-            print("\n2. Testing get_disk_usage tool...")
-            disk_response = await client.post(
-                "http://localhost:8000/mcp/",
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json, text/event-stream"
-                },
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 2,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "get_disk_usage",
-                        "arguments": {}
-                    }
-                }
-            )
-            
-            print(f"Disk usage response status: {disk_response.status_code}")
+                out.append(f"❌ Health check failed: {health_response.status_code}\n")
+                out.append(f"Response: {health_response.text}\n")
+
+            out.append("\n2. Testing get_disk_usage tool...\n")
+            out.append(f"Disk usage response status: {disk_response.status_code}\n")
             if disk_response.status_code == 200:
-                print("✅ Disk usage tool successful!")
+                out.append("✅ Disk usage tool successful!\n")
                 # Parse the response to extract the actual content
                 try:
-                    response_data = disk_response.json()
+                    response_data = parse_mcp_response(disk_response)
                     if 'result' in response_data and 'content' in response_data['result']:
-                        content = response_data['result']['content']
-                        if content and len(content) > 0 and 'text' in content[0]:
-                            print(f"Disk usage info received ({len(content[0]['text'])} characters)")
-                            # Show first few lines
-                            lines = content[0]['text'].split('\n')[:10]
-                            print("First 10 lines:")
+                        text = joined_text(response_data['result']['content'])
+                        if text:
+                            out.append(f"Disk usage info received ({len(text)} characters)\n")
+                            # Show first few lines; cap the split at the limit
+                            # so the whole string isn't scanned
+                            lines = text.split('\n', 10)[:10]
+                            out.append("First 10 lines:\n")
                             for line in lines:
-                                print(f"  {line}")
+                                out.append(f"  {line}\n")
                         else:
-                            print("No text content in response")
+                            out.append("No text content in response\n")
                     else:
-                        print(f"Unexpected response structure: {response_data}")
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {e}")
-                    print(f"Raw response: {disk_response.text}")
+                        out.append(f"Unexpected response structure: {response_data}\n")
+                except orjson.JSONDecodeError as e:
+                    out.append(f"JSON decode error: {e}\n")
+                    out.append(f"Raw response: {disk_response.text}\n")
             else:
-                print(f"❌ Disk usage tool failed: {disk_response.status_code}")
-                print(f"Response: {disk_response.text}")
-            
-            # Test get_detailed_disk_info
-            print("\n3. Testing get_detailed_disk_info tool...")
-            detailed_response = await client.post(
-                "http://localhost:8000/mcp/",
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json, text/event-stream"
-                },
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 3,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "get_detailed_disk_info",
-                        "arguments": {}
-                    }
-                }
-            )
-            
-            print(f"Detailed disk info response status: {detailed_response.status_code}")
+                out.append(f"❌ Disk usage tool failed: {disk_response.status_code}\n")
+                out.append(f"Response: {disk_response.text}\n")
+
+            out.append("\n3. Testing get_detailed_disk_info tool...\n")
+            out.append(f"Detailed disk info response status: {detailed_response.status_code}\n")
             if detailed_response.status_code == 200:
-                print("✅ Detailed disk info tool successful!")
+                out.append("✅ Detailed disk info tool successful!\n")
                 try:
-                    response_data = detailed_response.json()
+                    response_data = parse_mcp_response(detailed_response)
                     if 'result' in response_data and 'content' in response_data['result']:
-                        content = response_data['result']['content']
-                        if content and len(content) > 0 and 'text' in content[0]:
-                            text_length = len(content[0]['text'])
-                            print(f"Detailed disk info received ({text_length} characters)")
+                        text = joined_text(response_data['result']['content'])
+                        if text:
+                            out.append(f"Detailed disk info received ({len(text)} characters)\n")
                             # Show first few lines
-                            lines = content[0]['text'].split('\n')[:15]
-                            print("First 15 lines:")
+                            lines = text.split('\n', 15)[:15]
+                            out.append("First 15 lines:\n")
                             for line in lines:
-                                print(f"  {line}")
+                                out.append(f"  {line}\n")
                         else:
-                            print("No text content in response")
+                            out.append("No text content in response\n")
                     else:
-                        print(f"Unexpected response structure: {response_data}")
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {e}")
-                    print(f"Raw response: {detailed_response.text}")
+                        out.append(f"Unexpected response structure: {response_data}\n")
+                except orjson.JSONDecodeError as e:
+                    out.append(f"JSON decode error: {e}\n")
+                    out.append(f"Raw response: {detailed_response.text}\n")
             else:
-                print(f"❌ Detailed disk info tool failed: {detailed_response.status_code}")
-                print(f"Response: {detailed_response.text}")
-            
-            # Test list_tools
-            print("\n4. Testing list_tools...")
-            list_response = await client.post(
-                "http://localhost:8000/mcp/",
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json, text/event-stream"
-                },
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 4,
-                    "method": "tools/list",
-                    "params": {}
-                }
-            )
-            
-            print(f"List tools response status: {list_response.status_code}")
+                out.append(f"❌ Detailed disk info tool failed: {detailed_response.status_code}\n")
+                out.append(f"Response: {detailed_response.text}\n")
+
+            out.append("\n4. Testing list_tools...\n")
+            out.append(f"List tools response status: {list_response.status_code}\n")
             if list_response.status_code == 200:
-                print("✅ List tools successful!")
+                out.append("✅ List tools successful!\n")
                 try:
-                    response_data = list_response.json()
+                    response_data = parse_mcp_response(list_response)
                     if 'result' in response_data and 'tools' in response_data['result']:
                         tools = response_data['result']['tools']
-                        print(f"Available tools ({len(tools)}):")
+                        out.append(f"Available tools ({len(tools)}):\n")
                         for tool in tools:
-                            print(f"  - {tool['name']}: {tool['description']}")
+                            out.append(f"  - {tool['name']}: {tool['description']}\n")
                     else:
-                        print(f"Unexpected response structure: {response_data}")
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {e}")
-                    print(f"Raw response: {list_response.text}")
+                        out.append(f"Unexpected response structure: {response_data}\n")
+                except orjson.JSONDecodeError as e:
+                    out.append(f"JSON decode error: {e}\n")
+                    out.append(f"Raw response: {list_response.text}\n")
             else:
-                print(f"❌ List tools failed: {list_response.status_code}")
-                print(f"Response: {list_response.text}")
-                
+                out.append(f"❌ List tools failed: {list_response.status_code}\n")
+                out.append(f"Response: {list_response.text}\n")
+
     except Exception as e:
-        print(f"❌ Client test failed: {e}")
+        out.append(f"❌ Client test failed: {e}\n")
         import traceback
         traceback.print_exc()
+    finally:
+        sys.stdout.write("".join(out))
 
 if __name__ == "__main__":
     print("HTTP MCP Client Test")